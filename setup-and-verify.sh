@@ -208,8 +208,8 @@ if [ "$SKIP_INSTALL" = false ]; then
   echo ""
 
   print_step "Installing DrissionPage (Python)..."
-  pip3 install DrissionPage --break-system-packages 2>&1 | tail -3
-  print_success "DrissionPage Python package installed"
+  pip3 install DrissionPage numpy Pillow orjson --break-system-packages 2>&1 | tail -3
+  print_success "DrissionPage Python packages installed"
 else
   print_step "Skipping install (--test mode)"
 fi
@@ -277,15 +277,16 @@ print_step "Verifying DrissionPage Python bridge..."
 PYTHON_CHECK=$(python3 -c "
 try:
     from DrissionPage import ChromiumPage, ChromiumOptions
+    import numpy
     print('OK')
-except ImportError:
-    print('MISSING')
+except ImportError as e:
+    print('MISSING:' + (e.name or 'DrissionPage'))
 " 2>/dev/null || echo "ERROR")
 
 if [ "$PYTHON_CHECK" = "OK" ]; then
-  print_success "DrissionPage Python package verified ✓"
-elif [ "$PYTHON_CHECK" = "MISSING" ]; then
-  print_warning "DrissionPage not installed. Run: pip3 install DrissionPage --break-system-packages"
+  print_success "DrissionPage and numpy Python packages verified ✓"
+elif [ "${PYTHON_CHECK#MISSING:}" != "$PYTHON_CHECK" ]; then
+  print_warning "${PYTHON_CHECK#MISSING:} not installed. Run: pip3 install DrissionPage numpy Pillow orjson --break-system-packages"
 else
   print_warning "Python check failed (Python 3 may not be installed)"
 fi
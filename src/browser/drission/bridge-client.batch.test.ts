@@ -0,0 +1,36 @@
+import { afterEach, describe, expect, it } from "vitest";
+import {
+    emit,
+    lastRequest,
+    resetBridgeTestState,
+    startBridge,
+} from "./bridge-client.test-helpers.js";
+
+describe("DrissionBridge batch", () => {
+    afterEach(() => {
+        resetBridgeTestState();
+    });
+
+    it("settles each entry of a batch response array", async () => {
+        const { bridge, proc } = await startBridge();
+        const results = bridge.batch([
+            { method: "get_page_info" },
+            { method: "execute_js", params: { code: "boom()" } },
+        ]);
+        const reqs = lastRequest(proc) as Array<{ id: number; method: string }>;
+        expect(reqs.map((r) => r.method)).toEqual(["get_page_info", "execute_js"]);
+
+        emit(
+            proc,
+            JSON.stringify([
+                { id: reqs[0].id, result: { url: "u", title: "t", ready: true } },
+                { id: reqs[1].id, error: { code: -32000, message: "boom" } },
+            ]) + "\n",
+        );
+
+        const [info, js] = await results;
+        expect(info).toEqual({ status: "fulfilled", value: { url: "u", title: "t", ready: true } });
+        expect(js.status).toBe("rejected");
+        expect((js as PromiseRejectedResult).reason.message).toContain("boom");
+    });
+});
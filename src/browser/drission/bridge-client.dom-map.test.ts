@@ -0,0 +1,55 @@
+import { afterEach, describe, expect, it } from "vitest";
+import {
+    emit,
+    lastRequest,
+    resetBridgeTestState,
+    startBridge,
+} from "./bridge-client.test-helpers.js";
+
+describe("DrissionBridge DOM map", () => {
+    afterEach(() => {
+        resetBridgeTestState();
+    });
+
+    it("rebuilds DOM map rows from columns", async () => {
+        const { bridge, proc } = await startBridge();
+        const map = bridge.getDomMap();
+        const { id } = lastRequest(proc) as { id: number };
+
+        const columns = {
+            ids: [1, 2],
+            selectors: ["#go", "a.next"],
+            tags: ["button", "a"],
+            texts: ["Go", "Next"],
+            types: ["button", "link"],
+            xs: [10, 50],
+            ys: [20, 60],
+            widths: [30, 70],
+            heights: [40, 80],
+        };
+        emit(proc, JSON.stringify({ id, result: { columns, url: "u", title: "t" } }) + "\n");
+
+        await expect(map).resolves.toEqual({
+            url: "u",
+            title: "t",
+            elements: [
+                {
+                    id: 1,
+                    selector: "#go",
+                    tag: "button",
+                    text: "Go",
+                    type: "button",
+                    rect: { x: 10, y: 20, width: 30, height: 40 },
+                },
+                {
+                    id: 2,
+                    selector: "a.next",
+                    tag: "a",
+                    text: "Next",
+                    type: "link",
+                    rect: { x: 50, y: 60, width: 70, height: 80 },
+                },
+            ],
+        });
+    });
+});
@@ -0,0 +1,52 @@
+import { EventEmitter } from "node:events";
+import { type Mock, vi } from "vitest";
+import type { DrissionBridge } from "./bridge-client.js";
+
+export type FakeProcess = EventEmitter & {
+    stdin: { writable: boolean; write: Mock<(chunk: string) => boolean> };
+    stdout: EventEmitter;
+    stderr: EventEmitter;
+    kill: Mock<() => boolean>;
+};
+
+const spawnMock: Mock<(...args: unknown[]) => FakeProcess> = vi.hoisted(() => vi.fn());
+
+vi.mock("node:child_process", () => ({ spawn: spawnMock }));
+
+function fakeProcess(): FakeProcess {
+    return Object.assign(new EventEmitter(), {
+        stdin: { writable: true, write: vi.fn((_chunk: string) => true) },
+        stdout: new EventEmitter(),
+        stderr: new EventEmitter(),
+        kill: vi.fn(() => true),
+    });
+}
+
+/** Start a bridge against a fake Python process that has sent its ready line. */
+export async function startBridge(): Promise<{ bridge: DrissionBridge; proc: FakeProcess }> {
+    const { DrissionBridge } = await import("./bridge-client.js");
+    const proc = fakeProcess();
+    spawnMock.mockReturnValue(proc);
+    const bridge = new DrissionBridge();
+    const started = bridge.start();
+    emit(proc, '{"ready":true,"framing":"content-length"}\n');
+    await started;
+    return { bridge, proc };
+}
+
+export function resetBridgeTestState(): void {
+    spawnMock.mockReset();
+}
+
+/** Feed chunks to the bridge as if the Python process wrote them to stdout. */
+export function emit(proc: FakeProcess, ...chunks: Array<string | Buffer>): void {
+    for (const chunk of chunks) {
+        proc.stdout.emit("data", typeof chunk === "string" ? Buffer.from(chunk) : chunk);
+    }
+}
+
+/** The most recent request line written to the bridge's stdin. */
+export function lastRequest(proc: FakeProcess): unknown {
+    const calls = proc.stdin.write.mock.calls;
+    return JSON.parse(calls[calls.length - 1][0]);
+}
@@ -0,0 +1,94 @@
+import { afterEach, describe, expect, it } from "vitest";
+import {
+    emit,
+    lastRequest,
+    resetBridgeTestState,
+    startBridge,
+} from "./bridge-client.test-helpers.js";
+
+function binaryHeaderLine(id: number, length: number): string {
+    return (
+        JSON.stringify({
+            id,
+            result: { $binary: true, length, format: "png", width: 1920, height: 1080, scale: 1 },
+        }) + "\n"
+    );
+}
+
+// Includes bytes that are not valid UTF-8 to check the frame is kept binary
+const PNG_BYTES = Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a, 0x00, 0xff]);
+
+describe("DrissionBridge stdout parsing", () => {
+    afterEach(() => {
+        resetBridgeTestState();
+    });
+
+    it("reassembles a binary frame split across chunks", async () => {
+        const { bridge, proc } = await startBridge();
+        const shot = bridge.screenshot({ format: "png" });
+        const { id } = lastRequest(proc) as { id: number };
+
+        const frame = Buffer.concat([
+            Buffer.from(`Content-Length: ${PNG_BYTES.length}\r\n\r\n`),
+            PNG_BYTES,
+        ]);
+        const header = binaryHeaderLine(id, PNG_BYTES.length);
+        emit(
+            proc,
+            header.slice(0, 10),
+            header.slice(10),
+            frame.subarray(0, 7),
+            frame.subarray(7, 25),
+            frame.subarray(25),
+        );
+
+        await expect(shot).resolves.toEqual({
+            format: "png",
+            width: 1920,
+            height: 1080,
+            scale: 1,
+            base64: PNG_BYTES.toString("base64"),
+        });
+    });
+
+    it("handles a header, its frame and the next response in one chunk", async () => {
+        const { bridge, proc } = await startBridge();
+        const shot = bridge.screenshot({ format: "png" });
+        const shotId = (lastRequest(proc) as { id: number }).id;
+        const info = bridge.getPageInfo();
+        const infoId = (lastRequest(proc) as { id: number }).id;
+
+        emit(
+            proc,
+            Buffer.concat([
+                Buffer.from(binaryHeaderLine(shotId, PNG_BYTES.length)),
+                Buffer.from(`Content-Length: ${PNG_BYTES.length}\r\n\r\n`),
+                PNG_BYTES,
+                Buffer.from(
+                    JSON.stringify({ id: infoId, result: { url: "u", title: "t", ready: true } }) +
+                        "\n",
+                ),
+            ]),
+        );
+
+        await expect(shot).resolves.toMatchObject({ base64: PNG_BYTES.toString("base64") });
+        await expect(info).resolves.toEqual({ url: "u", title: "t", ready: true });
+    });
+
+    it("rejects the request on a bad frame header and recovers", async () => {
+        const { bridge, proc } = await startBridge();
+        const shot = bridge.screenshot({ format: "png" });
+        const { id } = lastRequest(proc) as { id: number };
+
+        emit(proc, binaryHeaderLine(id, 5), "Bogus: 5\r\n\r\nhello");
+        await expect(shot).rejects.toThrow(/Invalid binary frame header/);
+
+        const info = bridge.getPageInfo();
+        const infoId = (lastRequest(proc) as { id: number }).id;
+        emit(
+            proc,
+            JSON.stringify({ id: infoId, result: { url: "u", title: "t", ready: true } }) + "\n",
+        );
+        await expect(info).resolves.toEqual({ url: "u", title: "t", ready: true });
+    });
+});
@@ -7,12 +7,14 @@
 
 import { spawn, type ChildProcess } from "node:child_process";
 import path from "node:path";
-import readline from "node:readline";
 
 import type {
+    BinaryResultHeader,
     BridgeRequest,
     BridgeResponse,
     ClickResult,
+    DomElement,
+    DomMapColumns,
     DomMapResult,
     ExecuteJsResult,
     NavigateResult,
@@ -29,6 +31,8 @@ const BRIDGE_SCRIPT = path.join(
 /** Default timeout for bridge RPC calls (ms). */
 const DEFAULT_TIMEOUT_MS = 30_000;
 
+const CONTENT_LENGTH_RE = /^Content-Length:\s*(\d+)$/i;
+
 type PendingRequest = {
     resolve: (value: unknown) => void;
     reject: (reason: Error) => void;
@@ -53,9 +57,55 @@ function findPython(): string {
     return "python3";
 }
 
+/**
+ * Parse a "Content-Length: N\r\n\r\n<bytes>" frame from the start of buf.
+ * Returns null until the whole frame has arrived.
+ */
+function readFrame(buf: Buffer): { payload: Buffer; end: number } | null {
+    const sep = buf.indexOf("\r\n\r\n");
+    if (sep === -1) {
+        return null;
+    }
+    const match = CONTENT_LENGTH_RE.exec(buf.subarray(0, sep).toString("ascii"));
+    if (!match) {
+        throw new Error(`Invalid binary frame header: ${buf.subarray(0, sep).toString("ascii")}`);
+    }
+    const start = sep + 4;
+    const end = start + Number(match[1]);
+    if (buf.length < end) {
+        return null;
+    }
+    return { payload: buf.subarray(start, end), end };
+}
+
+/**
+ * Rebuild row-form DOM elements from the bridge's columnar payload.
+ */
+function domElementsFromColumns(cols: DomMapColumns): DomElement[] {
+    return cols.ids.map((id, i) => ({
+        id,
+        selector: cols.selectors[i],
+        tag: cols.tags[i],
+        text: cols.texts[i],
+        type: cols.types[i],
+        rect: { x: cols.xs[i], y: cols.ys[i], width: cols.widths[i], height: cols.heights[i] },
+    }));
+}
+
+function isBinaryHeader(resp: BridgeResponse): resp is BinaryResultHeader {
+    return (
+        typeof resp.result === "object" &&
+        resp.result !== null &&
+        (resp.result as Record<string, unknown>).$binary === true
+    );
+}
+
 export class DrissionBridge {
     private process: ChildProcess | null = null;
-    private rl: readline.Interface | null = null;
+    private stdoutBuf: Buffer = Buffer.alloc(0);
+    /** Header line of a binary response whose frame has not fully arrived. */
+    private binaryHeader: BinaryResultHeader | null = null;
+    private onReadyLine: ((line: string) => void) | null = null;
     private nextId = 1;
     private pending = new Map<number, PendingRequest>();
     private ready = false;
@@ -99,7 +149,7 @@ export class DrissionBridge {
                 this.pending.clear();
             }
             this.process = null;
-            this.rl = null;
+            this.resetStdout();
             this.ready = false;
         });
 
@@ -112,19 +162,18 @@ export class DrissionBridge {
             }
         });
 
-        // Read JSON lines from stdout
-        this.rl = readline.createInterface({
-            input: this.process.stdout!,
-            crlfDelay: Infinity,
-        });
+        // Read JSON lines (and binary frames) from stdout
+        this.process.stdout!.on("data", (chunk: Buffer) => this.onStdout(chunk));
 
         this.readyPromise = new Promise<void>((resolve, reject) => {
             const timeout = setTimeout(() => {
+                this.onReadyLine = null;
                 reject(new Error("DrissionPage bridge did not become ready within 15s"));
             }, 15_000);
 
-            this.rl!.once("line", (line: string) => {
+            this.onReadyLine = (line: string) => {
                 clearTimeout(timeout);
+                this.onReadyLine = null;
                 try {
                     const msg = JSON.parse(line);
                     if (msg.ready) {
@@ -136,14 +185,7 @@ export class DrissionBridge {
                 } catch {
                     reject(new Error(`Invalid ready message: ${line}`));
                 }
-            });
-        });
-
-        this.rl.on("line", (line: string) => {
-            if (!this.ready) {
-                return; // First line handled above
-            }
-            this.handleResponse(line);
+            };
         });
 
         await this.readyPromise;
@@ -168,6 +210,7 @@ export class DrissionBridge {
 
             const timer = setTimeout(() => {
                 this.pending.delete(id);
+                this.cancelRemote(id);
                 reject(new Error(`Bridge RPC timeout after ${timeoutMs}ms: ${method}`));
             }, timeoutMs);
 
@@ -182,17 +225,138 @@ export class DrissionBridge {
         });
     }
 
+    /**
+     * Send several JSON-RPC requests as one batch line.
+     * The bridge answers with a single array; each entry settles independently.
+     */
+    batch(
+        calls: Array<{ method: string; params?: Record<string, unknown> }>,
+        timeoutMs = DEFAULT_TIMEOUT_MS,
+    ): Promise<Array<PromiseSettledResult<unknown>>> {
+        if (!this.process?.stdin?.writable) {
+            return Promise.reject(new Error("Bridge process not running"));
+        }
+
+        const reqs: BridgeRequest[] = [];
+        const results = calls.map(
+            (call) =>
+                new Promise<unknown>((resolve, reject) => {
+                    const id = this.nextId++;
+                    reqs.push({ id, method: call.method, params: call.params });
+
+                    const timer = setTimeout(() => {
+                        this.pending.delete(id);
+                        this.cancelRemote(id);
+                        reject(new Error(`Bridge RPC timeout after ${timeoutMs}ms: ${call.method}`));
+                    }, timeoutMs);
+
+                    this.pending.set(id, { resolve, reject, timer });
+                }),
+        );
+
+        this.process.stdin.write(JSON.stringify(reqs) + "\n");
+        return Promise.allSettled(results);
+    }
+
+    /**
+     * Ask the bridge to abandon an in-flight request (fire-and-forget).
+     * This only drops the bridge's response; a handler that is already
+     * running still finishes, so its side effects on the page still happen.
+     */
+    private cancelRemote(targetId: number): void {
+        if (!this.process?.stdin?.writable) {
+            return;
+        }
+        const req: BridgeRequest = { id: this.nextId++, method: "cancel", params: { id: targetId } };
+        this.process.stdin.write(JSON.stringify(req) + "\n");
+    }
+
+    /**
+     * Split stdout into JSON lines and Content-Length framed binary payloads.
+     */
+    private onStdout(chunk: Buffer): void {
+        this.stdoutBuf =
+            this.stdoutBuf.length > 0 ? Buffer.concat([this.stdoutBuf, chunk]) : chunk;
+
+        while (this.stdoutBuf.length > 0) {
+            if (this.binaryHeader) {
+                let frame: { payload: Buffer; end: number } | null;
+                try {
+                    frame = readFrame(this.stdoutBuf);
+                } catch (err) {
+                    // Stream is out of sync; fail the request and drop buffered output
+                    const header = this.binaryHeader;
+                    this.resetStdout();
+                    this.settle({
+                        id: header.id,
+                        error: { code: -32700, message: (err as Error).message },
+                    });
+                    return;
+                }
+                if (!frame) {
+                    return;
+                }
+                const header = this.binaryHeader;
+                this.binaryHeader = null;
+                this.stdoutBuf = this.stdoutBuf.subarray(frame.end);
+
+                const result: Record<string, unknown> = { ...header.result };
+                delete result.$binary;
+                delete result.length;
+                result.base64 = frame.payload.toString("base64");
+                this.settle({ id: header.id, result });
+                continue;
+            }
+
+            const nl = this.stdoutBuf.indexOf(0x0a);
+            if (nl === -1) {
+                return;
+            }
+            const line = this.stdoutBuf.subarray(0, nl).toString("utf8").replace(/\r$/, "");
+            this.stdoutBuf = this.stdoutBuf.subarray(nl + 1);
+
+            if (this.onReadyLine) {
+                this.onReadyLine(line);
+            } else if (this.ready) {
+                this.handleResponse(line);
+            }
+        }
+    }
+
+    private resetStdout(): void {
+        this.stdoutBuf = Buffer.alloc(0);
+        this.binaryHeader = null;
+    }
+
     /**
      * Handle a response line from the Python process.
      */
     private handleResponse(line: string): void {
-        let resp: BridgeResponse;
+        let parsed: BridgeResponse | BridgeResponse[];
         try {
-            resp = JSON.parse(line);
+            parsed = JSON.parse(line);
         } catch {
             return; // Ignore non-JSON lines
         }
 
+        if (Array.isArray(parsed)) {
+            for (const resp of parsed) {
+                this.settle(resp);
+            }
+            return;
+        }
+        if (isBinaryHeader(parsed)) {
+            // Raw bytes follow as a Content-Length frame
+            this.binaryHeader = parsed;
+            return;
+        }
+        this.settle(parsed);
+    }
+
+    /**
+     * Resolve or reject the pending request matching a response.
+     */
+    private settle(resp: BridgeResponse): void {
         const pending = this.pending.get(resp.id);
         if (!pending) {
             return;
@@ -246,20 +410,28 @@ export class DrissionBridge {
         });
     }
 
-    /** Take a screenshot. */
+    /** Take a screenshot (WebP by default; PNG if Pillow is unavailable). */
     async screenshot(opts?: {
-        format?: "png" | "jpeg";
+        format?: "png" | "jpeg" | "webp";
         fullPage?: boolean;
+        quality?: number;
+        scale?: number;
     }): Promise<ScreenshotResult> {
         return this.rpc("screenshot", {
-            format: opts?.format ?? "png",
+            format: opts?.format ?? "webp",
             fullPage: opts?.fullPage ?? false,
+            quality: opts?.quality ?? 75,
+            scale: opts?.scale ?? 1,
         });
     }
 
     /** Get DOM map of interactive elements (for text-mode AI). */
     async getDomMap(): Promise<DomMapResult> {
-        return this.rpc("get_dom_map", {});
+        const res = await this.rpc<{ columns: DomMapColumns; url: string; title: string }>(
+            "get_dom_map",
+            {},
+        );
+        return { elements: domElementsFromColumns(res.columns), url: res.url, title: res.title };
     }
 
     /** Scroll the page. */
@@ -297,8 +469,8 @@ export class DrissionBridge {
         }
         this.pending.clear();
 
-        this.rl?.close();
-        this.rl = null;
+        this.process?.stdout?.removeAllListeners("data");
+        this.resetStdout();
         this.process?.kill();
         this.process = null;
         this.ready = false;
@@ -9,49 +9,195 @@ Protocol:
   - Each request/response is a single JSON line terminated by newline.
   - Request:  {"id": 1, "method": "navigate", "params": {"url": "..."}}
   - Response: {"id": 1, "result": {...}} or {"id": 1, "error": {"code": -1, "message": "..."}}
+  - Batch:    a JSON array of requests on one line; answered with a single
+              JSON array of responses in the same order.
+  - Binary results (screenshots) are a JSON line whose result has
+    "$binary": true and "length": N, followed by "Content-Length: N\\r\\n\\r\\n"
+    and N raw bytes. Inside a batch array they are inlined as base64 instead.
+  - Requests run concurrently, so responses may arrive out of order; match
+    them by id. Actions that drive the page still run one at a time; only
+    get_page_info, selector-less wait and cancel run alongside them.
+  - {"id": 2, "method": "cancel", "params": {"id": 1}} abandons an in-flight
+    request, which then answers with error code -32800. Only the response
+    is abandoned: a handler already running in a worker thread runs to
+    completion, so its browser side effects still happen.
 """
 
+import asyncio
 import base64
+import io
 import json
 import os
+import random
 import sys
+import threading
+import time
 import traceback
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 # Ensure stealth_helpers is importable from same directory
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from stealth_helpers import (
-    add_human_noise_to_coords,
-    bezier_mouse_move,
-    get_random_viewport_point,
-    human_type,
-    random_delay,
-    random_scroll_jitter,
-)
+# Heavy optional imports happen here, before the ready handshake, so the
+# parent overlaps their cost with its own startup. A missing DrissionPage or
+# numpy only fails the 'init' call; a missing Pillow only disables re-encoding.
+try:
+    from stealth_helpers import (
+        add_human_noise_to_coords,
+        bezier_mouse_move,
+        get_random_viewport_point,
+        human_type,
+        random_scroll_jitter,
+    )
+    _helpers_import_error: Optional[ImportError] = None
+except ImportError as e:
+    _helpers_import_error = e
+
+try:
+    from DrissionPage import ChromiumOptions, ChromiumPage
+    _dp_import_error: Optional[ImportError] = None
+except ImportError as e:
+    ChromiumOptions = ChromiumPage = None
+    _dp_import_error = e
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# orjson is much faster on large payloads; fall back to the stdlib with
+# the same bytes-in/bytes-out contract
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+    _loads = json.loads
 
 # ── Globals ──
 _page = None
 _config: Dict[str, Any] = {}
+_inflight: Dict[Any, "asyncio.Future[Any]"] = {}
+_write_lock: Optional[asyncio.Lock] = None
 
+# Handlers run in worker threads against one shared ChromiumPage; anything
+# that drives the page holds this so two actions never overlap, even when
+# a cancelled handler is still finishing in the background
+_page_lock = threading.Lock()
 
-def _send_response(msg_id: int, result: Any = None, error: Optional[Dict] = None) -> None:
-    """Send a JSON-RPC response to stdout."""
+# Human-like pacing: actions schedule a pause instead of sleeping, and the
+# next action waits out the remainder, so overlapping pauses don't stack.
+# Read and written only under _page_lock, which is held across the wait,
+# the action and the update, so queued actions never share one pause.
+_next_action_deadline = 0.0
+
+# selector -> (viewport center x, y, text, monotonic time) from the last
+# get_dom_map, for elements whose center was on screen. Every handler that
+# can change the page clears it.
+_click_target_cache: Dict[str, Tuple[float, float, str, float]] = {}
+# Cached targets are trusted this long; the page has probably not shifted
+_CLICK_TARGET_TTL_S = 2.0
+
+# Result key marking a raw-bytes payload (see _write_response)
+BINARY_KEY = "$binary"
+
+# Multiple of 3 so each base64 chunk encodes without padding
+_B64_CHUNK_BYTES = 3 * 1024
+
+# Requests can carry large execute_js payloads; raise the StreamReader line cap
+_MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def _build_response(msg_id: int, result: Any = None, error: Optional[Dict] = None) -> Dict[str, Any]:
+    """Build a JSON-RPC response dict."""
     resp: Dict[str, Any] = {"id": msg_id}
     if error is not None:
         resp["error"] = error
     else:
         resp["result"] = result
-    line = json.dumps(resp, ensure_ascii=False, default=str)
-    sys.stdout.write(line + "\n")
-    sys.stdout.flush()
+    return resp
 
 
-def _send_error(msg_id: int, code: int, message: str, data: Any = None) -> None:
+def _build_error(msg_id: int, code: int, message: str, data: Any = None) -> Dict[str, Any]:
     err: Dict[str, Any] = {"code": code, "message": message}
     if data is not None:
         err["data"] = data
-    _send_response(msg_id, error=err)
+    return _build_response(msg_id, error=err)
+
+
+def _write_line(payload: Any) -> None:
+    """Serialize a response (or batch of responses) as one JSON line on stdout."""
+    out = sys.stdout.buffer
+    out.write(_dumps(payload) + b"\n")
+    out.flush()
+
+
+def _split_binary(resp: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """Pull a raw-bytes payload out of a result, leaving a JSON-safe header."""
+    result = resp.get("result")
+    if not isinstance(result, dict) or not isinstance(result.get(BINARY_KEY), (bytes, bytearray)):
+        return resp, None
+    payload = result[BINARY_KEY]
+    header = dict(result)
+    header[BINARY_KEY] = True
+    header["length"] = len(payload)
+    return {"id": resp["id"], "result": header}, payload
+
+
+def _inline_binary_prefix(msg_id: Any, meta: Dict[str, Any]) -> bytes:
+    """
+    JSON text of a response up to the opening quote of its inlined "base64"
+    string, for binary responses inside a batch array.
+    """
+    fields = _dumps(meta)[1:-1]
+    prefix = b'{"id":' + _dumps(msg_id) + b',"result":{'
+    if fields:
+        prefix += fields + b","
+    return prefix + b'"base64":"'
+
+
+def _write_base64(write: Any, payload: bytes) -> None:
+    """
+    Write payload as base64 text in 3-byte-aligned chunks, so no full-size
+    encoded copy is ever held in memory.
+    """
+    for i in range(0, len(payload), _B64_CHUNK_BYTES):
+        write(base64.b64encode(payload[i:i + _B64_CHUNK_BYTES]))
+
+
+def _serialization_error(resp: Dict[str, Any], exc: Exception) -> bytes:
+    """Encoded error response for a result that could not be serialized."""
+    return _dumps(_build_error(resp.get("id", 0), -32000, f"Failed to serialize result: {exc}"))
+
+
+def _write_response(resp: Dict[str, Any]) -> None:
+    """
+    Write a single response. Results carrying raw bytes are sent as a JSON
+    header line followed by a "Content-Length: N\\r\\n\\r\\n<bytes>" frame.
+    A result that cannot be serialized (e.g. a lone surrogate, or an int
+    wider than 64 bits under orjson) is answered with an error instead.
+    """
+    header, payload = _split_binary(resp)
+    try:
+        line = _dumps(header)
+    except Exception as e:
+        line, payload = _serialization_error(resp, e), None
+    out = sys.stdout.buffer
+    out.write(line + b"\n")
+    if payload is not None:
+        out.write(b"Content-Length: %d\r\n\r\n" % len(payload))
+        out.write(payload)
+    out.flush()
+
+
+def _send_error(msg_id: int, code: int, message: str, data: Any = None) -> None:
+    _write_line(_build_error(msg_id, code, message, data))
 
 
 def _get_delay_range() -> tuple:
@@ -61,10 +207,186 @@ def _get_delay_range() -> tuple:
     return (min_ms, max_ms)
 
 
+def _extend_deadline(delay_s: float) -> None:
+    """
+    Push the earliest start of the next action at least delay_s from now.
+    Caller holds _page_lock.
+    """
+    global _next_action_deadline
+    _next_action_deadline = max(_next_action_deadline, time.monotonic() + delay_s)
+
+
 def _apply_human_delay() -> None:
-    """Apply a random delay if stealth mode is active."""
+    """Schedule a random pause before the next action if stealth mode is active."""
     min_ms, max_ms = _get_delay_range()
-    random_delay(min_ms, max_ms)
+    _extend_deadline(random.uniform(min_ms, max_ms) / 1000.0)
+
+
+def _wait_for_deadline() -> None:
+    """
+    Sleep out whatever remains of the pause scheduled by earlier actions.
+    Caller holds _page_lock until its action has rescheduled the deadline.
+    """
+    remaining = _next_action_deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+# ── Page Scripts ──
+
+# Installs window.__sirabot_dom_map(), which collects interactive elements
+# with auto-assigned numeric IDs, plus the preload helpers around it.
+# Registered once per page via Page.addScriptToEvaluateOnNewDocument so
+# scans only ship a short call.
+_DOM_MAP_JS_INSTALL = """
+{
+    const QUERY = 'a, button, input, select, textarea, [role="button"], [role="link"], [role="tab"], [onclick], [tabindex]';
+
+    window.__sirabot_dom_map = () => {
+        const elements = document.querySelectorAll(QUERY);
+        // Columnar (one array per field) to avoid repeating keys per element
+        const ids = [], selectors = [], tags = [], texts = [], types = [];
+        const xs = [], ys = [], widths = [], heights = [];
+        const selectorCache = new WeakMap();
+        let id = 1;
+        for (const el of elements) {
+            // Cheap size check first; then one computed-style read for both props
+            const rect = el.getBoundingClientRect();
+            if (rect.width === 0 && rect.height === 0) continue;
+            const cs = getComputedStyle(el);
+            if (cs.display === 'none' || cs.visibility === 'hidden') continue;
+
+            const tag = el.tagName.toLowerCase();
+            const role = el.getAttribute('role');
+            let type = tag;
+            if (tag === 'input') type = 'input:' + (el.type || 'text');
+            if (tag === 'a') type = 'link';
+            if (role) type = 'role:' + role;
+
+            const text = (el.textContent || el.value || el.placeholder || el.getAttribute('aria-label') || '').trim().substring(0, 100);
+
+            ids.push(id++);
+            selectors.push(buildSelector(el));
+            tags.push(tag);
+            texts.push(text);
+            types.push(type);
+            xs.push(Math.round(rect.x));
+            ys.push(Math.round(rect.y));
+            widths.push(Math.round(rect.width));
+            heights.push(Math.round(rect.height));
+        }
+        const viewport = [innerWidth, innerHeight];
+        return { ids, selectors, tags, texts, types, xs, ys, widths, heights, viewport };
+
+        // Memoized per scan so elements sharing ancestors reuse their selectors
+        function buildSelector(el) {
+            const cached = selectorCache.get(el);
+            if (cached !== undefined) return cached;
+            let sel;
+            if (el.id) {
+                sel = '#' + CSS.escape(el.id);
+            } else {
+                const tag = el.tagName.toLowerCase();
+                const parent = el.parentElement;
+                if (!parent) {
+                    sel = tag;
+                } else {
+                    // Single pass: count same-tag siblings and find our position
+                    let idx = 0, count = 0;
+                    for (const c of parent.children) {
+                        if (c.tagName === el.tagName) {
+                            count++;
+                            if (c === el) idx = count;
+                        }
+                    }
+                    const seg = count === 1 ? tag : tag + ':nth-child(' + idx + ')';
+                    sel = buildSelector(parent) + ' > ' + seg;
+                }
+            }
+            selectorCache.set(el, sel);
+            return sel;
+        }
+    };
+
+    // Start a scan at DOMContentLoaded so the first get_dom_map after a
+    // navigation can return at once. Input, scrolling and the window load
+    // (late images and fonts shift layout) drop it as stale.
+    // Only the top-level frame is mapped, so iframes skip the scan.
+    window.__sirabot_dom_preload = () => {
+        if (window !== window.top) return;
+        window.__sirabot_dom_pending = new Promise(resolve => {
+            document.addEventListener('DOMContentLoaded', () => {
+                resolve({ map: window.__sirabot_dom_map(), candidates: document.querySelectorAll(QUERY).length });
+            }, { once: true });
+        });
+        const drop = () => { window.__sirabot_dom_pending = null; };
+        for (const evt of ['click', 'input', 'keydown', 'scroll']) {
+            addEventListener(evt, drop, { capture: true, once: true });
+        }
+        // Not capturing, so per-resource load events don't reach it
+        addEventListener('load', drop, { once: true });
+    };
+
+    // Hand out the preloaded scan once, if the candidate count still
+    // matches (scripts may have rendered more since); otherwise scan now
+    window.__sirabot_dom_take = () => {
+        const pending = window.__sirabot_dom_pending;
+        window.__sirabot_dom_pending = null;
+        if (!pending) return window.__sirabot_dom_map();
+        return pending.then(({ map, candidates }) =>
+            candidates === document.querySelectorAll(QUERY).length
+                ? Object.assign(map, { preloaded: true })
+                : window.__sirabot_dom_map());
+    };
+}
+"""
+
+# Field arrays returned by window.__sirabot_dom_map()
+_DOM_MAP_COLUMNS = ("ids", "selectors", "tags", "texts", "types", "xs", "ys", "widths", "heights")
+
+# Returns null when the helper is not installed in the current document.
+# May return a promise (the preloaded scan); run_js awaits it.
+_DOM_MAP_JS_CALL = "return window.__sirabot_dom_take ? window.__sirabot_dom_take() : null"
+
+# Resolves a selector, scrolls the element into view only if its center is
+# off screen, and returns its viewport center, text and whether it has a
+# visible box to click, in one round-trip.
+_CLICK_TARGET_JS = """
+const el = document.querySelector(arguments[0]);
+if (!el) return null;
+const cs = getComputedStyle(el);
+let r = el.getBoundingClientRect();
+if ((r.width === 0 && r.height === 0) || cs.display === 'none' || cs.visibility === 'hidden') {
+    return { visible: false };
+}
+let cx = r.x + r.width / 2, cy = r.y + r.height / 2;
+const scrolled = cx < 0 || cy < 0 || cx >= innerWidth || cy >= innerHeight;
+if (scrolled) {
+    el.scrollIntoView({ block: 'center', inline: 'center', behavior: 'instant' });
+    r = el.getBoundingClientRect();
+    cx = r.x + r.width / 2;
+    cy = r.y + r.height / 2;
+}
+return { x: cx, y: cy, text: (el.textContent || '').trim().slice(0, 200), scrolled, visible: true };
+"""
+
+# Anti-detection overrides, complementing the AutomationControlled flag:
+# hide navigator.webdriver. navigator.plugins is left alone: a hand-built
+# list lacks item()/namedItem() and fails `instanceof PluginArray`.
+_STEALTH_JS = """
+try {
+    Object.defineProperty(Navigator.prototype, 'webdriver', {
+        get: () => undefined,
+        configurable: true
+    });
+} catch (e) {}
+"""
+
+# Only valid in a fresh document: DOMContentLoaded must still be ahead
+_DOM_PRELOAD_JS = "window.__sirabot_dom_preload();\n"
+
+# Everything a new document needs, registered with a single CDP call
+_STEALTH_BOOTSTRAP = _STEALTH_JS + _DOM_MAP_JS_INSTALL + _DOM_PRELOAD_JS
 
 
 # ── Action Handlers ──
@@ -73,12 +395,15 @@ def handle_init(params: Dict[str, Any]) -> Dict[str, Any]:
     """Initialize the DrissionPage browser."""
     global _page, _config
 
-    try:
-        from DrissionPage import ChromiumPage, ChromiumOptions
-    except ImportError:
+    if _dp_import_error is not None:
         raise RuntimeError(
             "DrissionPage is not installed. Run: pip install DrissionPage"
-        )
+        ) from _dp_import_error
+    if _helpers_import_error is not None:
+        missing = _helpers_import_error.name or "numpy"
+        raise RuntimeError(
+            f"{missing} is not installed (needed by stealth_helpers). Run: pip install {missing}"
+        ) from _helpers_import_error
 
     _config = params.get("stealth", {})
 
@@ -121,6 +446,16 @@ def handle_init(params: Dict[str, Any]) -> Dict[str, Any]:
             co.set_argument(arg)
 
     _page = ChromiumPage(co)
+    _click_target_cache.clear()
+
+    # One bootstrap for stealth overrides and the DOM map helper. Chrome
+    # re-runs it on every new document; SPA route changes keep the same
+    # window, so it survives those too
+    if _config.get("disableWebdriverFlag", True):
+        bootstrap = _STEALTH_BOOTSTRAP
+    else:
+        bootstrap = _DOM_MAP_JS_INSTALL + _DOM_PRELOAD_JS
+    _page.run_cdp("Page.addScriptToEvaluateOnNewDocument", source=bootstrap)
 
     return {
         "status": "initialized",
@@ -128,12 +463,25 @@ def handle_init(params: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _cached_click_target(selector: str) -> Optional[Tuple[float, float, str]]:
+    """(x, y, text) cached by get_dom_map, or None if absent or stale."""
+    entry = _click_target_cache.get(selector)
+    if entry is None:
+        return None
+    x, y, text, ts = entry
+    if time.monotonic() - ts > _CLICK_TARGET_TTL_S:
+        return None
+    return (x, y, text)
+
+
 def handle_navigate(params: Dict[str, Any]) -> Dict[str, Any]:
     """Navigate to a URL."""
+    _wait_for_deadline()
     url = params.get("url", "")
     if not url:
         raise ValueError("url is required")
 
+    _click_target_cache.clear()
     _page.get(url)
     _apply_human_delay()
 
@@ -145,41 +493,51 @@ def handle_navigate(params: Dict[str, Any]) -> Dict[str, Any]:
 
 def handle_click_element(params: Dict[str, Any]) -> Dict[str, Any]:
     """Click an element by CSS selector."""
+    _wait_for_deadline()
     selector = params.get("selector", "")
     if not selector:
         raise ValueError("selector is required")
 
-    element = _page.ele(selector)
-    if element is None:
-        raise ValueError(f"Element not found: {selector}")
+    # A fresh get_dom_map entry needs no lookup; otherwise one run_js
+    # resolves the element, scrolls it into view and measures it
+    cached = _cached_click_target(selector)
+    if cached is not None:
+        x, y, text = cached
+    else:
+        target = _page.run_js(_CLICK_TARGET_JS, selector)
+        if target is None:
+            raise ValueError(f"Element not found: {selector}")
+        if not target["visible"]:
+            raise ValueError(f"Element has no visible box to click: {selector}")
+        x, y, text = target["x"], target["y"], target["text"]
+    x, y = int(x), int(y)
+    # The click may navigate or re-render, so no cached target survives it
+    _click_target_cache.clear()
 
     # Natural mouse movement to element if enabled
     if _config.get("naturalMouseMovement", True):
         try:
-            rect = element.rect
-            if rect:
-                target_x = int(rect.midpoint[0])
-                target_y = int(rect.midpoint[1])
-                start = get_random_viewport_point(
-                    _config.get("windowWidth", 1920),
-                    _config.get("windowHeight", 1080),
-                )
-                target = add_human_noise_to_coords(target_x, target_y)
-                bezier_mouse_move(_page, start, target)
+            start = get_random_viewport_point(
+                _config.get("windowWidth", 1920),
+                _config.get("windowHeight", 1080),
+            )
+            target_xy = add_human_noise_to_coords(x, y)
+            bezier_mouse_move(_page, start, target_xy)
         except Exception:
             pass
 
-    element.click()
+    _page.actions.click((x, y))
     _apply_human_delay()
 
     return {
         "success": True,
-        "elementDescription": str(element.text)[:200] if element.text else "",
+        "elementDescription": str(text)[:200] if text else "",
     }
 
 
 def handle_click_xy(params: Dict[str, Any]) -> Dict[str, Any]:
     """Click at specific (x, y) coordinates — used by vision mode."""
+    _wait_for_deadline()
     x = int(params.get("x", 0))
     y = int(params.get("y", 0))
 
@@ -191,7 +549,8 @@ def handle_click_xy(params: Dict[str, Any]) -> Dict[str, Any]:
         target = add_human_noise_to_coords(x, y)
         bezier_mouse_move(_page, start, target)
 
-    _page.actions.click(x, y)
+    _click_target_cache.clear()
+    _page.actions.click((x, y))
     _apply_human_delay()
 
     return {"success": True, "x": x, "y": y}
@@ -199,6 +558,7 @@ def handle_click_xy(params: Dict[str, Any]) -> Dict[str, Any]:
 
 def handle_type_text(params: Dict[str, Any]) -> Dict[str, Any]:
     """Type text into an element."""
+    _wait_for_deadline()
     selector = params.get("selector", "")
     text = params.get("text", "")
     clear = params.get("clear", True)
@@ -211,6 +571,7 @@ def handle_type_text(params: Dict[str, Any]) -> Dict[str, Any]:
     if element is None:
         raise ValueError(f"Element not found: {selector}")
 
+    _click_target_cache.clear()
     if clear:
         try:
             element.clear()
@@ -227,90 +588,105 @@ def handle_type_text(params: Dict[str, Any]) -> Dict[str, Any]:
     return {"success": True, "fieldDescription": selector}
 
 
+def _reencode_image(img_bytes: bytes, fmt: str, quality: int, scale: float) -> Optional[bytes]:
+    """
+    Re-encode a captured PNG with Pillow, optionally downscaled.
+    Returns None if Pillow is not installed or cannot encode the format
+    (e.g. a Pillow build without libwebp), so the caller ships the PNG.
+    """
+    if Image is None:
+        return None
+
+    pil_fmt = "JPEG" if fmt in ("jpg", "jpeg") else fmt.upper()
+    try:
+        img = Image.open(io.BytesIO(img_bytes))
+        if scale != 1.0:
+            w, h = img.size
+            img = img.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.BILINEAR)
+        if pil_fmt == "JPEG" and img.mode != "RGB":
+            img = img.convert("RGB")
+
+        buf = io.BytesIO()
+        img.save(buf, format=pil_fmt, quality=quality)
+    except (KeyError, OSError, ValueError):
+        # KeyError: unknown format; OSError: encoder missing from this build
+        return None
+    return buf.getvalue()
+
+
 def handle_screenshot(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Take a screenshot and return as base64."""
-    fmt = params.get("format", "png")
+    """Take a screenshot and return the raw image bytes (WebP by default)."""
+    _wait_for_deadline()
+    fmt = params.get("format", "webp")
     full_page = params.get("fullPage", False)
+    quality = int(params.get("quality", 75))
+    scale = float(params.get("scale", 1.0))
+
+    # Chrome captures PNG; WebP and scaled output are produced with Pillow
+    reencode = fmt == "webp" or scale != 1.0
+    capture_fmt = "png" if reencode else fmt
 
     # DrissionPage screenshot to bytes
     try:
-        img_bytes = _page.get_screenshot(as_bytes=fmt, full_page=full_page)
+        img_bytes = _page.get_screenshot(as_bytes=capture_fmt, full_page=full_page)
     except TypeError:
         # Fallback for different DrissionPage versions
         img_bytes = _page.get_screenshot(as_bytes=True)
+        capture_fmt = "png"
 
-    b64 = base64.b64encode(img_bytes).decode("ascii")
+    if reencode:
+        encoded = _reencode_image(img_bytes, fmt, quality, scale)
+        if encoded is None:
+            # Pillow missing or encoder unavailable: ship the PNG as captured
+            fmt, scale = capture_fmt, 1.0
+        else:
+            img_bytes = encoded
 
     width = _config.get("windowWidth", 1920)
     height = _config.get("windowHeight", 1080)
 
+    # Raw bytes are sent as a Content-Length frame by _write_response
     return {
-        "base64": b64,
+        BINARY_KEY: img_bytes,
         "format": fmt,
         "width": width,
         "height": height,
+        "scale": scale,
     }
 
 
 def handle_get_dom_map(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Scan the DOM and return interactive elements with auto-assigned numeric IDs.
-    Used by text-mode (non-vision) AI interaction.
-    """
-    # JavaScript to extract interactive elements
-    js_code = """
-    (() => {
-        const selectors = 'a, button, input, select, textarea, [role="button"], [role="link"], [role="tab"], [onclick], [tabindex]';
-        const elements = document.querySelectorAll(selectors);
-        const results = [];
-        let id = 1;
-        for (const el of elements) {
-            const rect = el.getBoundingClientRect();
-            if (rect.width === 0 && rect.height === 0) continue;
-            if (window.getComputedStyle(el).display === 'none') continue;
-            if (window.getComputedStyle(el).visibility === 'hidden') continue;
-
-            const tag = el.tagName.toLowerCase();
-            let type = tag;
-            if (tag === 'input') type = 'input:' + (el.type || 'text');
-            if (tag === 'a') type = 'link';
-            if (el.getAttribute('role')) type = 'role:' + el.getAttribute('role');
-
-            const text = (el.textContent || el.value || el.placeholder || el.getAttribute('aria-label') || '').trim().substring(0, 100);
-
-            results.push({
-                id: id++,
-                selector: buildSelector(el),
-                tag: tag,
-                text: text,
-                type: type,
-                rect: {
-                    x: Math.round(rect.x),
-                    y: Math.round(rect.y),
-                    width: Math.round(rect.width),
-                    height: Math.round(rect.height)
-                }
-            });
-        }
-        return results;
-
-        function buildSelector(el) {
-            if (el.id) return '#' + CSS.escape(el.id);
-            const tag = el.tagName.toLowerCase();
-            const parent = el.parentElement;
-            if (!parent) return tag;
-            const siblings = Array.from(parent.children).filter(c => c.tagName === el.tagName);
-            if (siblings.length === 1) return buildSelector(parent) + ' > ' + tag;
-            const idx = siblings.indexOf(el) + 1;
-            return buildSelector(parent) + ' > ' + tag + ':nth-child(' + idx + ')';
-        }
-    })()
+    Used by text-mode (non-vision) AI interaction. Elements are returned
+    column-wise: one array per field, index i across arrays is element i.
     """
-
-    elements = _page.run_js(js_code)
+    _wait_for_deadline()
+    columns = _page.run_js(_DOM_MAP_JS_CALL)
+    if columns is None:
+        # Helper missing (document loaded before init, or CSP dropped it):
+        # install it in the current document and retry
+        _page.run_js(_DOM_MAP_JS_INSTALL)
+        columns = _page.run_js(_DOM_MAP_JS_CALL)
+    if not columns:
+        columns = {name: [] for name in _DOM_MAP_COLUMNS}
+
+    # Remember on-screen targets so click_element can skip its lookup. A
+    # scan preloaded at DOMContentLoaded may predate layout shifts, so skip it.
+    viewport = columns.pop("viewport", None)
+    if not columns.pop("preloaded", False) and viewport:
+        vw, vh = viewport
+        now = time.monotonic()
+        for selector, text, x, y, w, h in zip(
+            columns["selectors"], columns["texts"],
+            columns["xs"], columns["ys"], columns["widths"], columns["heights"],
+        ):
+            cx, cy = x + w / 2, y + h / 2
+            if 0 <= cx < vw and 0 <= cy < vh:
+                _click_target_cache[selector] = (cx, cy, text, now)
 
     return {
-        "elements": elements or [],
+        "columns": columns,
         "url": _page.url,
         "title": _page.title,
     }
@@ -318,6 +694,7 @@ def handle_get_dom_map(params: Dict[str, Any]) -> Dict[str, Any]:
 
 def handle_scroll(params: Dict[str, Any]) -> Dict[str, Any]:
     """Scroll the page."""
+    _wait_for_deadline()
     direction = params.get("direction", "down")
     amount = int(params.get("amount", 300))
 
@@ -329,10 +706,11 @@ def handle_scroll(params: Dict[str, Any]) -> Dict[str, Any]:
         _page.scroll.to_top()
     elif direction == "bottom":
         _page.scroll.to_bottom()
+    _click_target_cache.clear()
 
     # Add jitter for realism
     if _config.get("naturalMouseMovement", True):
-        random_scroll_jitter(_page, max_delta=30)
+        _extend_deadline(random_scroll_jitter(_page, max_delta=30))
 
     _apply_human_delay()
     return {"success": True, "direction": direction}
@@ -344,23 +722,26 @@ def handle_wait(params: Dict[str, Any]) -> Dict[str, Any]:
     selector = params.get("selector")
 
     if selector:
-        try:
-            _page.wait.ele_displayed(selector, timeout=ms / 1000.0)
-            return {"success": True, "waited_for": selector}
-        except Exception:
-            return {"success": False, "waited_for": selector, "timedOut": True}
+        # Only a selector wait touches the page; a plain sleep runs unlocked
+        with _page_lock:
+            try:
+                _page.wait.ele_displayed(selector, timeout=ms / 1000.0)
+                return {"success": True, "waited_for": selector}
+            except Exception:
+                return {"success": False, "waited_for": selector, "timedOut": True}
     else:
-        import time
         time.sleep(ms / 1000.0)
         return {"success": True, "waited_ms": ms}
 
 
 def handle_execute_js(params: Dict[str, Any]) -> Dict[str, Any]:
     """Execute arbitrary JavaScript on the page."""
+    _wait_for_deadline()
     code = params.get("code", "")
     if not code:
         raise ValueError("code is required")
 
+    _click_target_cache.clear()
     result = _page.run_js(code)
     return {"result": result}
 
@@ -388,56 +769,221 @@ def handle_get_page_info(params: Dict[str, Any]) -> Dict[str, Any]:
 
 # ── Method Dispatch ──
 
+# method name -> (handler, requires an initialized browser, runs under _page_lock)
 METHODS = {
-    "init": handle_init,
-    "navigate": handle_navigate,
-    "click_element": handle_click_element,
-    "click_xy": handle_click_xy,
-    "type_text": handle_type_text,
-    "screenshot": handle_screenshot,
-    "get_dom_map": handle_get_dom_map,
-    "scroll": handle_scroll,
-    "wait": handle_wait,
-    "execute_js": handle_execute_js,
-    "close": handle_close,
-    "get_page_info": handle_get_page_info,
+    "init": (handle_init, False, True),
+    "navigate": (handle_navigate, True, True),
+    "click_element": (handle_click_element, True, True),
+    "click_xy": (handle_click_xy, True, True),
+    "type_text": (handle_type_text, True, True),
+    "screenshot": (handle_screenshot, True, True),
+    "get_dom_map": (handle_get_dom_map, True, True),
+    "scroll": (handle_scroll, True, True),
+    # Locks itself only when waiting on a selector
+    "wait": (handle_wait, True, False),
+    "execute_js": (handle_execute_js, True, True),
+    "close": (handle_close, False, True),
+    "get_page_info": (handle_get_page_info, True, False),
 }
 
 
-def main() -> None:
-    """Main loop: read JSON-RPC from stdin, dispatch, write response to stdout."""
-    # Signal ready
-    sys.stdout.write(json.dumps({"ready": True}) + "\n")
-    sys.stdout.flush()
+def _run_exclusive(handler: Any, params: Dict[str, Any]) -> Any:
+    """Run a page handler while holding _page_lock. Runs in a worker thread."""
+    with _page_lock:
+        return handler(params)
 
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
 
-        msg_id = 0
+def _cancel_request(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cancel an in-flight request by id. Runs on the event loop thread.
+
+    This only abandons the response; a handler already running in the
+    executor cannot be interrupted and finishes in the background.
+    """
+    target = params.get("id")
+    fut = _inflight.get(target)
+    if fut is None or fut.done():
+        return {"cancelled": False, "id": target}
+    fut.cancel()
+    return {"cancelled": True, "id": target}
+
+
+async def _process_one(req: Any) -> Dict[str, Any]:
+    """Dispatch a single JSON-RPC request and build its response dict."""
+    msg_id = 0
+    try:
+        # The protocol guarantees id and method; a missing one is an invalid request
+        try:
+            msg_id = req["id"]
+            method = req["method"]
+        except (KeyError, TypeError):
+            return _build_error(msg_id, -32600, "Invalid request: 'id' and 'method' are required")
+        # Checked before dispatch: an id that can't key _inflight would only
+        # fail after the handler had already started
+        if msg_id is not None and not isinstance(msg_id, (str, int)):
+            return _build_error(0, -32600, "Invalid request: 'id' must be a string, integer or null")
+        params = req.get("params") or {}
+
+        if method == "cancel":
+            return _build_response(msg_id, _cancel_request(params))
+
+        entry = METHODS.get(method)
+        if entry is None:
+            return _build_error(msg_id, -32601, f"Method not found: {method}")
+
+        handler, requires_page, exclusive = entry
+        if requires_page and _page is None:
+            return _build_error(msg_id, -32000, "Browser not initialized. Call 'init' first.")
+
+        # Handlers block on DrissionPage / time.sleep, so keep them off the loop
+        loop = asyncio.get_running_loop()
+        if exclusive:
+            fut = loop.run_in_executor(None, _run_exclusive, handler, params)
+        else:
+            fut = loop.run_in_executor(None, handler, params)
+        _inflight[msg_id] = fut
+        try:
+            result = await fut
+        except asyncio.CancelledError:
+            return _build_error(msg_id, -32800, "Request cancelled")
+        finally:
+            _inflight.pop(msg_id, None)
+
+        return _build_response(msg_id, result)
+
+    except Exception as e:
+        tb = traceback.format_exc()
+        return _build_error(msg_id, -32000, str(e), {"traceback": tb})
+
+
+async def _stream_batch(requests: list) -> None:
+    """
+    Answer a batch by writing each response as soon as it is produced, so
+    only one response (and its screenshot bytes) is held in memory at a
+    time. The caller holds the write lock for the whole array to keep it
+    contiguous; other responses wait until the batch has finished.
+    """
+    write = sys.stdout.buffer.write
+    write(b"[")
+    first = True
+    for req in requests:
+        resp = await _process_one(req)
+        header, payload = _split_binary(resp)
+        # Encode everything that can fail before writing the separator, so
+        # a bad element becomes an error object and the array still closes
         try:
-            req = json.loads(line)
-            msg_id = req.get("id", 0)
-            method = req.get("method", "")
-            params = req.get("params", {})
+            if payload is None:
+                head = _dumps(resp)
+            else:
+                meta = header["result"]
+                del meta[BINARY_KEY], meta["length"]
+                head = _inline_binary_prefix(resp["id"], meta)
+        except Exception as e:
+            head, payload = _serialization_error(resp, e), None
+
+        write(head if first else b"," + head)
+        first = False
+        if payload is not None:
+            _write_base64(write, payload)
+            write(b'"}}')
+    write(b"]\n")
+    sys.stdout.buffer.flush()
+
+
+async def _handle(req: Any) -> None:
+    """Run one request (or batch) and write its response under the write lock."""
+    if isinstance(req, list):
+        if not req:
+            # JSON-RPC 2.0: an empty batch gets a single error, not an empty array
+            async with _write_lock:
+                _send_error(0, -32600, "Invalid request: empty batch")
+            return
+        # JSON-RPC 2.0 batch: one array in, one array out
+        async with _write_lock:
+            await _stream_batch(req)
+        return
+
+    resp = await _process_one(req)
+    async with _write_lock:
+        _write_response(resp)
+
+
+async def _read_lines():
+    """
+    Yield raw lines from stdin without blocking the event loop. A line longer
+    than _MAX_LINE_BYTES is skipped and yielded as None.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=_MAX_LINE_BYTES)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except (NotImplementedError, OSError, ValueError):
+        # Pipe transports are unavailable for some stdin handles (e.g. Windows);
+        # fall back to a reader thread, which has no line cap.
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
+            if not line:
+                return
+            yield line
+
+    oversized = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            line = e.partial  # EOF, possibly after an unterminated last line
+        except asyncio.LimitOverrunError as e:
+            # The first e.consumed bytes hold no newline: drop them and keep
+            # skipping until the oversized line ends
+            await reader.readexactly(e.consumed)
+            oversized = True
+            continue
+
+        if oversized:
+            oversized = False
+            yield None
+            continue
+        if not line:
+            break
+        yield line
 
-            handler = METHODS.get(method)
-            if handler is None:
-                _send_error(msg_id, -32601, f"Method not found: {method}")
-                continue
 
-            if method != "init" and _page is None and method not in ("close",):
-                _send_error(msg_id, -32000, "Browser not initialized. Call 'init' first.")
-                continue
+async def main() -> None:
+    """Main loop: read JSON-RPC from stdin, dispatch concurrently, write responses to stdout."""
+    global _write_lock
+    _write_lock = asyncio.Lock()
 
-            result = handler(params)
-            _send_response(msg_id, result)
+    # Signal ready
+    _write_line({"ready": True, "framing": "content-length"})
+
+    loads = _loads
+    create_task = asyncio.create_task
+    tasks = set()
+    async for raw in _read_lines():
+        if raw is None:
+            async with _write_lock:
+                _send_error(0, -32600, f"Invalid request: line exceeds {_MAX_LINE_BYTES} bytes")
+            continue
+
+        line = raw.strip()
+        if not line:
+            continue
 
+        try:
+            req = loads(line)
         except Exception as e:
-            tb = traceback.format_exc()
-            _send_error(msg_id, -32000, str(e), {"traceback": tb})
+            async with _write_lock:
+                _send_error(0, -32700, f"Parse error: {e}")
+            continue
+
+        task = create_task(_handle(req))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    # stdin closed: let in-flight requests finish before exiting
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -36,6 +36,7 @@ export type {
     CaptchaProviderConfig,
     ClickResult,
     DomElement,
+    DomMapColumns,
     DomMapResult,
     DrissionBrowserConfig,
     ExecuteJsResult,
@@ -8,6 +8,11 @@ import random
 import time
 from typing import Tuple, List, Optional
 
+import numpy as np
+
+# PCG64 generator: per-action random values are drawn as vectors in one call
+_rng = np.random.default_rng()
+
 
 def random_delay(min_ms: float = 200, max_ms: float = 800) -> None:
     """Sleep for a random duration between min_ms and max_ms milliseconds."""
@@ -15,16 +20,6 @@ def random_delay(min_ms: float = 200, max_ms: float = 800) -> None:
     time.sleep(delay)
 
 
-def _bezier_point(t: float, p0: float, p1: float, p2: float, p3: float) -> float:
-    """Compute a point on a cubic Bézier curve at parameter t."""
-    return (
-        (1 - t) ** 3 * p0
-        + 3 * (1 - t) ** 2 * t * p1
-        + 3 * (1 - t) * t ** 2 * p2
-        + t ** 3 * p3
-    )
-
-
 def bezier_curve_points(
     start: Tuple[float, float],
     end: Tuple[float, float],
@@ -43,19 +38,27 @@ def bezier_curve_points(
 
     # Randomize control points with some spread proportional to distance
     spread = max(dist * 0.3, 30)
-    x1 = x0 + dx * random.uniform(0.2, 0.4) + random.uniform(-spread, spread)
-    y1 = y0 + dy * random.uniform(0.2, 0.4) + random.uniform(-spread, spread)
-    x2 = x0 + dx * random.uniform(0.6, 0.8) + random.uniform(-spread, spread)
-    y2 = y0 + dy * random.uniform(0.6, 0.8) + random.uniform(-spread, spread)
+    r = _rng.uniform(
+        [0.2, 0.2, 0.6, 0.6, -spread, -spread, -spread, -spread],
+        [0.4, 0.4, 0.8, 0.8, spread, spread, spread, spread],
+    )
+    x1 = x0 + dx * r[0] + r[4]
+    y1 = y0 + dy * r[1] + r[5]
+    x2 = x0 + dx * r[2] + r[6]
+    y2 = y0 + dy * r[3] + r[7]
+
+    # Evaluate the cubic Bernstein basis for all t at once
+    t = np.linspace(0.0, 1.0, num_points + 1)
+    one_minus_t = 1.0 - t
+    b0 = one_minus_t ** 3
+    b1 = 3.0 * one_minus_t ** 2 * t
+    b2 = 3.0 * one_minus_t * t ** 2
+    b3 = t ** 3
 
-    points = []
-    for i in range(num_points + 1):
-        t = i / num_points
-        x = _bezier_point(t, x0, x1, x2, x3)
-        y = _bezier_point(t, y0, y1, y2, y3)
-        points.append((int(round(x)), int(round(y))))
+    xs = b0 * x0 + b1 * x1 + b2 * x2 + b3 * x3
+    ys = b0 * y0 + b1 * y1 + b2 * y2 + b3 * y3
 
-    return points
+    return list(zip(xs.round().astype(int).tolist(), ys.round().astype(int).tolist()))
 
 
 def bezier_mouse_move(page, start: Tuple[int, int], end: Tuple[int, int]) -> None:
@@ -63,14 +66,15 @@ def bezier_mouse_move(page, start: Tuple[int, int], end: Tuple[int, int]) -> Non
     Move the mouse from start to end along a natural-looking Bézier curve.
     Each step has a small random delay to mimic human speed variation.
     """
-    num_points = random.randint(15, 30)
+    num_points = int(_rng.integers(15, 31))
     points = bezier_curve_points(
         (float(start[0]), float(start[1])),
         (float(end[0]), float(end[1])),
         num_points,
     )
+    sleeps = _rng.uniform(0.005, 0.025, size=len(points)).tolist()
 
-    for px, py in points:
+    for (px, py), pause in zip(points, sleeps):
         try:
             page.actions.move(px, py)
         except Exception:
@@ -79,11 +83,15 @@ def bezier_mouse_move(page, start: Tuple[int, int], end: Tuple[int, int]) -> Non
                 page.actions.move_to(px, py)
             except Exception:
                 break
-        time.sleep(random.uniform(0.005, 0.025))
+        time.sleep(pause)
 
 
-def random_scroll_jitter(page, max_delta: int = 100) -> None:
-    """Perform a small random scroll to mimic human browsing behavior."""
+def random_scroll_jitter(page, max_delta: int = 100) -> float:
+    """
+    Perform a small random scroll to mimic human browsing behavior.
+    Returns the pause (seconds) to leave before the next action; the
+    caller schedules it rather than this helper sleeping.
+    """
     delta = random.randint(-max_delta, max_delta)
     if delta == 0:
         delta = random.choice([-30, 30])
@@ -91,39 +99,65 @@ def random_scroll_jitter(page, max_delta: int = 100) -> None:
         page.scroll.down(delta) if delta > 0 else page.scroll.up(abs(delta))
     except Exception:
         pass
-    random_delay(100, 300)
+    return random.uniform(0.1, 0.3)
+
+
+def _typing_bursts(
+    text: str, min_char_delay_ms: float, max_char_delay_ms: float
+) -> List[Tuple[str, float]]:
+    """
+    Split text into short bursts (3-6 chars) paired with the total delay
+    to sleep after each one. A burst ends early on an occasional thinking
+    pause, whose longer delay replaces that character's normal delay.
+    """
+    n = len(text)
+    char_delays = _rng.uniform(min_char_delay_ms / 1000.0, max_char_delay_ms / 1000.0, size=n)
+    # Occasional longer pause (simulates thinking)
+    pauses = _rng.random(n) < 0.05
+    char_delays[pauses] = _rng.uniform(0.3, 0.8, size=int(pauses.sum()))
+    run_lens = _rng.integers(3, 7, size=n).tolist()
+
+    bursts = []
+    i = 0
+    for run_len in run_lens:
+        if i >= n:
+            break
+        j = min(i + run_len, n)
+        hits = np.flatnonzero(pauses[i:j])
+        if hits.size:
+            j = i + int(hits[0]) + 1
+        bursts.append((text[i:j], float(char_delays[i:j].sum())))
+        i = j
+    return bursts
 
 
 def human_type(element, text: str, min_char_delay_ms: float = 50, max_char_delay_ms: float = 200) -> None:
     """
-    Type text character by character with variable delays,
-    mimicking human typing speed and occasional pauses.
+    Type text in short bursts with variable delays, mimicking human typing
+    speed and occasional pauses. Each burst is a single input() call, so
+    the CDP message count scales with bursts rather than characters.
     """
-    for i, char in enumerate(text):
+    for run, delay in _typing_bursts(text, min_char_delay_ms, max_char_delay_ms):
         try:
-            element.input(char)
+            element.input(run)
         except Exception:
             try:
-                element.type(char)
+                element.type(run)
             except Exception:
                 break
-
-        # Occasional longer pause (simulates thinking)
-        if random.random() < 0.05:
-            time.sleep(random.uniform(0.3, 0.8))
-        else:
-            time.sleep(random.uniform(min_char_delay_ms / 1000.0, max_char_delay_ms / 1000.0))
+        time.sleep(delay)
 
 
 def get_random_viewport_point(width: int = 1920, height: int = 1080) -> Tuple[int, int]:
     """Get a random point within the viewport for initial mouse positioning."""
-    x = random.randint(int(width * 0.1), int(width * 0.9))
-    y = random.randint(int(height * 0.1), int(height * 0.9))
+    x, y = _rng.integers(
+        [int(width * 0.1), int(height * 0.1)],
+        [int(width * 0.9) + 1, int(height * 0.9) + 1],
+    ).tolist()
     return (x, y)
 
 
 def add_human_noise_to_coords(x: int, y: int, max_offset: int = 3) -> Tuple[int, int]:
     """Add small random noise to coordinates to avoid pixel-perfect clicks."""
-    nx = x + random.randint(-max_offset, max_offset)
-    ny = y + random.randint(-max_offset, max_offset)
-    return (max(0, nx), max(0, ny))
+    ox, oy = _rng.integers(-max_offset, max_offset + 1, size=2).tolist()
+    return (max(0, x + ox), max(0, y + oy))
@@ -16,6 +16,12 @@ export type BridgeResponse = {
     error?: { code: number; message: string; data?: unknown };
 };
 
+/** Header line of a result whose raw bytes follow as a Content-Length frame. */
+export type BinaryResultHeader = {
+    id: number;
+    result: { $binary: true; length: number; [key: string]: unknown };
+};
+
 // ── Stealth Config ──
 
 export type StealthConfig = {
@@ -66,15 +72,30 @@ export type DomMapResult = {
     title: string;
 };
 
+/** Wire format of `get_dom_map`: one array per field, index i is element i. */
+export type DomMapColumns = {
+    ids: number[];
+    selectors: string[];
+    tags: string[];
+    texts: string[];
+    types: string[];
+    xs: number[];
+    ys: number[];
+    widths: number[];
+    heights: number[];
+};
+
 export type ScreenshotResult = {
     /** Base64-encoded image data. */
     base64: string;
     /** Image format. */
-    format: "png" | "jpeg";
+    format: "png" | "jpeg" | "webp";
     /** Viewport width at time of capture. */
     width: number;
     /** Viewport height at time of capture. */
     height: number;
+    /** Image-to-viewport scale factor (divide image coordinates by this to click). */
+    scale?: number;
 };
 
 export type VisionClickResult = {
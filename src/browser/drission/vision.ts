@@ -61,7 +61,7 @@ export function findElementById(
  * 3. Click at coordinates
  */
 export async function visionScreenshot(bridge: DrissionBridge): Promise<ScreenshotResult> {
-    return bridge.screenshot({ format: "png", fullPage: false });
+    return bridge.screenshot({ format: "webp", fullPage: false });
 }
 
 /**